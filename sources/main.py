@@ -2,7 +2,7 @@
 Readme Development Metrics With waka time progress
 """
 
-from asyncio import run
+from asyncio import gather, run
 from datetime import datetime
 from typing import Dict
 from urllib.parse import quote
@@ -169,16 +169,16 @@ async def get_short_github_info() -> str:
         disk_usage = FM.t("Used in GitHub's Storage") % naturalsize(GHM.USER.disk_usage)
     stats += f"> 📦 {disk_usage} \n > \n"
 
-    data = await DM.get_remote_json("github_stats")
-    if data is None:
+    years = await DM.get_remote_json_items("github_stats")
+    if years is None:
         DBM.p("GitHub contributions data unavailable!")
         return stats
 
     DBM.i("Adding contributions info...")
-    if len(data["years"]) > 0:
+    if len(years) > 0:
         contributions = FM.t("Contributions in the year") % (
-            intcomma(data["years"][0]["total"]),
-            data["years"][0]["year"],
+            intcomma(years[0]["total"]),
+            years[0]["year"],
         )
         stats += f"> 🏆 {contributions}\n > \n"
     else:
@@ -213,15 +213,15 @@ async def get_short_github_info() -> str:
 
 async def collect_user_repositories() -> Dict:
     DBM.i("Getting user repositories list...")
-    repositories = await DM.get_remote_graphql(
-        "user_repository_list", username=GHM.USER.login, id=GHM.USER.node_id
+    repositories, contributed = await gather(
+        DM.get_remote_graphql(
+            "user_repository_list", username=GHM.USER.login, id=GHM.USER.node_id
+        ),
+        DM.get_remote_graphql("repos_contributed_to", username=GHM.USER.login),
     )
     repo_names = [repo["name"] for repo in repositories]
     DBM.g("\tUser repository list collected!")
 
-    contributed = await DM.get_remote_graphql(
-        "repos_contributed_to", username=GHM.USER.login
-    )
     contributed_nodes = [
         repo
         for repo in contributed
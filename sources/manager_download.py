@@ -1,15 +1,49 @@
-from asyncio import Task, create_task
-from hashlib import md5
-from json import dumps
+from asyncio import Semaphore, Task, create_task, gather, sleep
+from functools import reduce
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+from itertools import chain
+from operator import getitem
+from random import random
 from string import Template
-from typing import Awaitable, Dict, Callable, Optional, List, Tuple
+from time import time
+from types import MappingProxyType
+from typing import Any, Dict, Callable, Optional, List, Tuple
 
-from httpx import AsyncClient
-from yaml import safe_load
+from httpx import AsyncClient, Limits, Response, Timeout
+from ijson import items_coro, sendable_list
+from orjson import JSONDecodeError, dumps, loads
+from yaml import load as load_yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 from manager_environment import EnvironmentManager as EM
+from manager_file import FileManager as FM
 from manager_debug import DebugManager as DBM
 
+# Commit history query, '%s' is replaced with the list of requested commit fields.
+_REPO_COMMIT_HISTORY_QUERY = """
+{
+    repository(owner: "$owner", name: "$name") {
+        ref(qualifiedName: "refs/heads/$branch") {
+            target {
+                ... on Commit {
+                    history(author: { id: "$id" }, $pagination) {
+                        nodes {
+                            ... on Commit { %s }
+                        }
+                        pageInfo { endCursor hasNextPage }
+                    }
+                }
+            }
+        }
+    }
+}
+"""
+
 GITHUB_API_QUERIES = {
     "repos_contributed_to": """
 {
@@ -51,24 +85,9 @@ GITHUB_API_QUERIES = {
     }
 }
 """,
-    "repo_commit_list": """
-{
-    repository(owner: "$owner", name: "$name") {
-        ref(qualifiedName: "refs/heads/$branch") {
-            target {
-                ... on Commit {
-                    history(author: { id: "$id" }, $pagination) {
-                        nodes {
-                            ... on Commit { additions deletions committedDate oid }
-                        }
-                        pageInfo { endCursor hasNextPage }
-                    }
-                }
-            }
-        }
-    }
-}
-""",
+    "repo_commit_list": _REPO_COMMIT_HISTORY_QUERY % "additions deletions committedDate oid",
+    "repo_commit_stats": _REPO_COMMIT_HISTORY_QUERY % "additions deletions committedDate",
+    "repo_commit_ids": _REPO_COMMIT_HISTORY_QUERY % "committedDate oid",
     "hide_outdated_comment": """
 mutation {
     minimizeComment(input: {classifier: OUTDATED, subjectId: "$id"}) {
@@ -77,6 +96,32 @@ mutation {
 }
 """,
 }
+# Queries are never modified at runtime, expose them as read-only mapping.
+GITHUB_API_QUERIES = MappingProxyType(GITHUB_API_QUERIES)
+
+_COMPILED_QUERIES: Dict[str, Template] = {name: Template(query) for name, query in GITHUB_API_QUERIES.items()}
+
+# Time (in seconds) GraphQL query results are kept in persistent cache, queries not listed here are never cached.
+_DISK_CACHE_TTL: Dict[str, int] = {
+    "repos_contributed_to": 24 * 60 * 60,
+    "user_repository_list": 24 * 60 * 60,
+    "repo_branch_list": 24 * 60 * 60,
+    "repo_commit_list": 7 * 24 * 60 * 60,
+    "repo_commit_stats": 7 * 24 * 60 * 60,
+    "repo_commit_ids": 7 * 24 * 60 * 60,
+}
+
+# Number of queries merged into one batched request, _GRAPHQL_BATCH_SIZE is used for queries not listed here;
+# commit additions and deletions are expensive for GitHub to compute, so requests including them are kept small.
+_GRAPHQL_BATCH_SIZES: Dict[str, int] = {
+    "repo_commit_list": 3,
+    "repo_commit_stats": 3,
+}
+
+# Queries that are updated incrementally while cached: only commits newer than the latest cached one
+# (minus _INCREMENTAL_OVERLAP, to account for clock skew) are fetched and merged into the cached list.
+_INCREMENTAL_QUERIES = ("repo_commit_list", "repo_commit_stats", "repo_commit_ids")
+_INCREMENTAL_OVERLAP = timedelta(hours=1)
 
 
 async def init_download_manager(user_login: str):
@@ -86,13 +131,59 @@ async def init_download_manager(user_login: str):
         waka_7days=f"https://wakapi.陈莹.我爱你/api/compat/wakatime/v1/users/current/stats/last_7_days?api_key={EM.WAKATIME_API_KEY}",
         waka_last_12_months=f"https://wakapi.陈莹.我爱你/api/compat/wakatime/v1/users/current/stats/last_12_months?api_key={EM.WAKATIME_API_KEY}",
         waka_all=f"https://wakapi.陈莹.我爱你/api/compat/wakatime/v1/users/current/all_time_since_today?api_key={EM.WAKATIME_API_KEY}",
-        github_stats=f"https://github-contributions.vercel.app/api/v1/{user_login}",
+    )
+    # 贡献数据体积较大，只流式解析需要的 'years' 部分
+    await DownloadManager.load_remote_json_items(
+        github_stats=(f"https://github-contributions.vercel.app/api/v1/{user_login}", "years.item"),
     )
 
 
 class DownloadManager:
-    _client = AsyncClient(timeout=60.0)
+    _client: Optional[AsyncClient] = None
     _REMOTE_RESOURCES_CACHE = dict()
+    _PAGINATION_PATH_CACHE: Dict[str, Tuple] = dict()
+
+    _GRAPHQL_CONCURRENCY = 6
+    _GRAPHQL_MAX_BACKOFF = 30
+    _GRAPHQL_BATCH_SIZE = 10
+    _GRAPHQL_BATCH_RETRIES = 2
+    _graphql_semaphore: Optional[Semaphore] = None
+
+    @staticmethod
+    def get_client() -> AsyncClient:
+        """
+        Return the shared HTTP client, creating it on first use.
+        The client is created lazily so that it is bound to the running event loop.
+        HTTP/2 lets all GitHub GraphQL requests be multiplexed over a single connection,
+        while the keep-alive pool is reused by the other remote resources.
+        Brotli and zstd response compression is requested where servers support it.
+
+        :returns: Shared AsyncClient instance.
+        """
+        if DownloadManager._client is None:
+            DownloadManager._client = AsyncClient(
+                http2=True,
+                limits=Limits(
+                    max_keepalive_connections=32,
+                    max_connections=64,
+                    keepalive_expiry=60.0,
+                ),
+                timeout=Timeout(60.0, connect=10.0),
+                headers={"Accept-Encoding": "zstd, br, gzip"},
+            )
+        return DownloadManager._client
+
+    @staticmethod
+    def _get_graphql_semaphore() -> Semaphore:
+        """
+        Return the semaphore limiting concurrent GitHub GraphQL requests, creating it on first use.
+        Too many simultaneous queries trigger GitHub secondary rate limits (502/403/429 responses).
+
+        :returns: Shared Semaphore instance.
+        """
+        if DownloadManager._graphql_semaphore is None:
+            DownloadManager._graphql_semaphore = Semaphore(DownloadManager._GRAPHQL_CONCURRENCY)
+        return DownloadManager._graphql_semaphore
 
     @staticmethod
     async def load_remote_resources(**resources: str):
@@ -102,49 +193,112 @@ class DownloadManager:
         re-awaited and also prevents 'coroutine was never awaited' warnings.
         """
         for resource, url in resources.items():
+            headers = DownloadManager._get_conditional_headers(resource)
             # create_task wraps the coroutine in a Task that can be awaited multiple times
             DownloadManager._REMOTE_RESOURCES_CACHE[resource] = create_task(
-                DownloadManager._client.get(url)
+                DownloadManager.get_client().get(url, headers=headers)
             )
+        # yield to the event loop once so that all requests are sent right away,
+        # instead of waiting for the first consumer to await its resource
+        await sleep(0)
+
+    @staticmethod
+    async def load_remote_json_items(**resources: Tuple[str, str]):
+        """
+        Start background GET requests for JSON resources, parsing only items under given prefix.
+        Responses are parsed incrementally while they are being downloaded, the rest of the JSON is skipped.
+        Tasks are stored in the cache, the same way as in load_remote_resources.
+
+        :param resources: Resource names mapped to (URL, ijson items prefix) pairs.
+        """
+        for resource, (url, prefix) in resources.items():
+            DownloadManager._REMOTE_RESOURCES_CACHE[resource] = create_task(
+                DownloadManager._stream_remote_json_items(resource, url, prefix)
+            )
+        await sleep(0)
+
+    @staticmethod
+    async def _stream_remote_json_items(resource: str, url: str, prefix: str) -> Optional[List]:
+        """
+        Download JSON resource and parse items under given prefix from the response stream.
+
+        :param resource: Resource name, used for logging.
+        :param url: Resource URL.
+        :param prefix: ijson items prefix (e.g. 'years.item').
+        :returns: List of parsed items or None if the resource is not ready yet.
+        """
+        async with DownloadManager.get_client().stream("GET", url) as res:
+            if res.status_code in (201, 202):
+                DBM.w(f"\tQuery '{resource}' returned {res.status_code} status code")
+                return None
+            elif res.status_code != 200:
+                await res.aread()
+                raise Exception(
+                    f"Query '{res.url}' failed to run by returning code of {res.status_code}: {res.json()}"
+                )
+
+            events = sendable_list()
+            parser = items_coro(events, prefix)
+            items = list()
+            async for chunk in res.aiter_bytes():
+                parser.send(chunk)
+                items += events
+                del events[:]
+            parser.close()
+            items += events
+        return items
+
+    @staticmethod
+    def _get_conditional_headers(resource: str) -> Dict[str, str]:
+        """
+        Build conditional request headers for a resource stored in persistent cache.
+        Resource is only considered cached if both its parsed content and response metadata are saved.
+
+        :param resource: Resource name.
+        :returns: 'If-None-Match' and 'If-Modified-Since' headers, empty if resource is not cached.
+        """
+        meta = FM.read_cache(f"{resource}.meta")
+        if meta is None or not FM.has_cache(f"{resource}.json"):
+            return dict()
+        try:
+            meta = loads(meta)
+        except JSONDecodeError:
+            return dict()
+        headers = dict()
+        if meta.get("ETag") is not None:
+            headers["If-None-Match"] = meta["ETag"]
+        if meta.get("Last-Modified") is not None:
+            headers["If-Modified-Since"] = meta["Last-Modified"]
+        return headers
 
     @staticmethod
     async def close_remote_resources():
         """
-        Cancel and await all running Tasks/Awaitables in the cache.
-        Be defensive: a Task may have already completed with an exception.
-        We catch and ignore exceptions here to avoid failing shutdown.
+        Cancel all running Tasks in the cache and close the HTTP client.
+        Tasks are awaited together, so that their exceptions (including cancellation)
+        are retrieved and not reported by the event loop at shutdown.
         """
-        for resource in list(DownloadManager._REMOTE_RESOURCES_CACHE.values()):
-            try:
-                if isinstance(resource, Task):
-                    # Cancel if still pending
-                    if not resource.done():
-                        resource.cancel()
-                    try:
-                        await resource
-                    except Exception:
-                        # swallow exceptions during shutdown (network errors, cancels, etc.)
-                        pass
-                elif isinstance(resource, Awaitable):
-                    try:
-                        await resource
-                    except Exception:
-                        pass
-            except Exception:
-                # extra defensive guard: shouldn't normally happen
-                pass
+        tasks = [resource for resource in DownloadManager._REMOTE_RESOURCES_CACHE.values() if isinstance(resource, Task)]
+        for task in tasks:
+            task.cancel()
+        await gather(*tasks, return_exceptions=True)
+
+        if DownloadManager._client is not None:
+            await DownloadManager._client.aclose()
+            DownloadManager._client = None
+        DownloadManager._graphql_semaphore = None
 
     @staticmethod
     async def _get_remote_resource(
-        resource: str, convertor: Optional[Callable[[bytes], Dict]]
+        resource: str, convertor: Optional[Callable[[bytes], Dict]], persistent: bool = False
     ) -> Dict or None:
         DBM.i(f"\tMaking a remote API query named '{resource}'...")
         cached = DownloadManager._REMOTE_RESOURCES_CACHE[resource]
-        # If the cache entry is an awaitable (Task), await it and then replace cache with the Response
-        if isinstance(cached, Awaitable):
+        # If the cache entry is a Task, await it and then replace cache with the Response
+        if isinstance(cached, Task):
             try:
                 res = await cached
-                # replace the Task/Awaitable in cache with the resolved Response
+                # replace the Task in cache with the resolved Response
                 DownloadManager._REMOTE_RESOURCES_CACHE[resource] = res
                 DBM.g(f"\tQuery '{resource}' finished, result saved!")
             except Exception as e:
@@ -158,7 +312,28 @@ class DownloadManager:
             DBM.g(f"\tQuery '{resource}' loaded from cache!")
 
         if res.status_code == 200:
-            return res.json() if convertor is None else convertor(res.content)
+            data = loads(res.content) if convertor is None else convertor(res.content)
+            if persistent and ("ETag" in res.headers or "Last-Modified" in res.headers):
+                meta = {"ETag": res.headers.get("ETag"), "Last-Modified": res.headers.get("Last-Modified")}
+                # metadata is written last, so it never refers to content that failed to save
+                FM.remove_cache(f"{resource}.meta")
+                FM.write_cache(f"{resource}.json", dumps(data))
+                FM.write_cache(f"{resource}.meta", dumps(meta))
+            return data
+        elif res.status_code == 304:
+            content = FM.read_cache(f"{resource}.json")
+            try:
+                data = None if content is None else loads(content)
+            except JSONDecodeError:
+                data = None
+            if data is not None:
+                DBM.g(f"\tQuery '{resource}' not modified, loaded from disk cache!")
+                return data
+            # disk cache is missing or corrupted, request the resource again without conditional headers
+            DBM.w(f"\tQuery '{resource}' disk cache can not be read, downloading it again...")
+            FM.remove_cache(f"{resource}.meta")
+            DownloadManager._REMOTE_RESOURCES_CACHE[resource] = create_task(DownloadManager.get_client().get(res.request.url))
+            return await DownloadManager._get_remote_resource(resource, convertor, persistent)
         elif res.status_code in (201, 202):
             DBM.w(f"\tQuery '{resource}' returned {res.status_code} status code")
             return None
@@ -172,94 +347,481 @@ class DownloadManager:
     async def get_remote_json(resource: str) -> Dict or None:
         return await DownloadManager._get_remote_resource(resource, None)
 
+    @staticmethod
+    async def get_remote_json_items(resource: str) -> List or None:
+        """
+        Get items of JSON resource loaded with load_remote_json_items.
+
+        :param resource: Resource name.
+        :returns: List of parsed items or None if the resource is not ready yet.
+        """
+        DBM.i(f"\tMaking a remote API query named '{resource}'...")
+        cached = DownloadManager._REMOTE_RESOURCES_CACHE[resource]
+        if isinstance(cached, Task):
+            try:
+                cached = await cached
+            except Exception as e:
+                DBM.w(f"\tQuery '{resource}' failed while awaiting remote request: {e}")
+                raise
+            DownloadManager._REMOTE_RESOURCES_CACHE[resource] = cached
+            DBM.g(f"\tQuery '{resource}' finished, result saved!")
+        else:
+            DBM.g(f"\tQuery '{resource}' loaded from cache!")
+        return cached
+
     @staticmethod
     async def get_remote_yaml(resource: str) -> Dict or None:
-        return await DownloadManager._get_remote_resource(resource, safe_load)
+        return await DownloadManager._get_remote_resource(
+            resource, lambda content: load_yaml(content, Loader=SafeLoader), True
+        )
+
+    @staticmethod
+    def _get_graphql_retry_delay(res: Response, attempt: int) -> Optional[float]:
+        """
+        Calculate delay before retrying a failed GitHub GraphQL request.
+        Rate limit headers ('Retry-After', 'X-RateLimit-Reset') are honored if present,
+        otherwise exponential backoff with jitter is used.
+
+        :param res: Failed response.
+        :param attempt: Number of the failed attempt, starting from 0.
+        :returns: Delay in seconds or None if the request should not be retried.
+        """
+        rate_limited = "Retry-After" in res.headers or res.headers.get("X-RateLimit-Remaining") == "0"
+        if res.status_code not in (502, 429) and not (res.status_code == 403 and rate_limited):
+            return None
+
+        retry_after = res.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+        rate_limit_reset = res.headers.get("X-RateLimit-Reset", "")
+        if res.headers.get("X-RateLimit-Remaining") == "0" and rate_limit_reset.isdigit():
+            return max(0.0, float(rate_limit_reset) - time()) + random()
+        return min(DownloadManager._GRAPHQL_MAX_BACKOFF, 2**attempt) + random()
+
+    @staticmethod
+    async def _post_graphql(name: str, document: str, retries_count: int = 10) -> Dict:
+        """
+        Send GraphQL document to GitHub API, retrying on rate limiting and server errors.
+
+        :param name: Query name, used for logging.
+        :param document: GraphQL query document.
+        :param retries_count: Maximum number of retries.
+        :returns: Parsed GraphQL response, containing 'data' (and possibly partial 'errors').
+        """
+        headers = {"Authorization": f"Bearer {EM.GH_TOKEN}", "Content-Type": "application/json"}
+        # body is serialized once and reused for retries
+        content = dumps({"query": document})
+        for attempt in range(retries_count + 1):
+            async with DownloadManager._get_graphql_semaphore():
+                res = await DownloadManager.get_client().post(
+                    "https://api.github.com/graphql",
+                    content=content,
+                    headers=headers,
+                )
+            if res.status_code == 200:
+                response = loads(res.content)
+                if response.get("data") is not None:
+                    return response
+                # query failures are reported as 200 responses without data, only timeouts and rate limiting are worth retrying
+                DBM.w(f"\tQuery '{name}' returned errors: {response.get('errors')}")
+                if DownloadManager._has_transient_graphql_errors(response):
+                    delay = min(DownloadManager._GRAPHQL_MAX_BACKOFF, 2**attempt) + random()
+                else:
+                    delay = None
+            else:
+                delay = DownloadManager._get_graphql_retry_delay(res, attempt)
+            if delay is None or attempt == retries_count:
+                break
+            DBM.w(f"\tQuery '{name}' returned {res.status_code} status code, retrying in {delay:.1f}s...")
+            await sleep(delay)
+
+        raise Exception(
+            f"Query '{name}' failed to run by returning code of {res.status_code}: {res.json()}"
+        )
+
+    @staticmethod
+    def _has_transient_graphql_errors(response: Dict) -> bool:
+        """
+        Check whether GraphQL response failed because of a query timeout or rate limiting, i.e. it might succeed if retried.
+
+        :param response: GraphQL response.
+        :returns: True if any of the errors is transient, false otherwise.
+        """
+        for error in response.get("errors", list()):
+            if error.get("type") == "RATE_LIMITED" or str(error.get("message", "")).startswith("Something went wrong while executing your query"):
+                return True
+        return False
+
+    @staticmethod
+    def _has_graphql_errors(response: Dict, alias: Optional[str] = None) -> bool:
+        """
+        Check whether GraphQL response contains errors, i.e. its data might be partial.
+
+        :param response: GraphQL response.
+        :param alias: Only check errors related to given top level field alias, None for any errors.
+        :returns: True if there are errors, false otherwise.
+        """
+        for error in response.get("errors", list()):
+            path = error.get("path")
+            if alias is None or not path or path[0] == alias:
+                return True
+        return False
 
     @staticmethod
     async def _fetch_graphql_query(
         query: str, retries_count: int = 10, **kwargs
     ) -> Dict:
-        headers = {"Authorization": f"Bearer {EM.GH_TOKEN}"}
-        res = await DownloadManager._client.post(
-            "https://api.github.com/graphql",
-            json={"query": Template(GITHUB_API_QUERIES[query]).substitute(kwargs)},
-            headers=headers,
+        return await DownloadManager._post_graphql(
+            query, _COMPILED_QUERIES[query].substitute(kwargs), retries_count
         )
-        if res.status_code == 200:
-            return res.json()
-        elif res.status_code == 502 and retries_count > 0:
-            return await DownloadManager._fetch_graphql_query(
-                query, retries_count - 1, **kwargs
-            )
-        else:
-            raise Exception(
-                f"Query '{query}' failed to run by returning code of {res.status_code}: {res.json()}"
-            )
 
     @staticmethod
-    def _find_pagination_and_data_list(response: Dict) -> Tuple[List, Dict]:
+    def _find_pagination_path(response: Dict) -> Optional[Tuple]:
         """
-        Traverse a nested GraphQL response dict and find the first dict that
-        contains both 'nodes' and 'pageInfo'. Return (nodes, pageInfo).
-        If not found, return ([], {'hasNextPage': False}).
+        Traverse a nested GraphQL response and find the first dict that
+        contains both 'nodes' and 'pageInfo' (depth-first, in key order).
 
         This is more robust than assuming intermediate dicts have only one key,
         because some nodes (e.g. 'target') may contain multiple keys like
         '__typename' and 'history'.
-        """
-        if not isinstance(response, dict):
-            return list(), dict(hasNextPage=False)
 
-        # Direct hit
-        if "nodes" in response and "pageInfo" in response:
-            return response["nodes"], response["pageInfo"]
-
-        # Recurse into dictionary values
-        for value in response.values():
+        :param response: GraphQL response.
+        :returns: Tuple of keys (and list indexes) leading to the dict or None if not found.
+        """
+        stack = [(tuple(), response)]
+        while len(stack) > 0:
+            path, value = stack.pop()
             if isinstance(value, dict):
-                nodes, page_info = DownloadManager._find_pagination_and_data_list(value)
-                if nodes or page_info.get("hasNextPage", False):
-                    return nodes, page_info
+                if "nodes" in value and "pageInfo" in value:
+                    return path
+                children = value.items()
             elif isinstance(value, list):
-                # Some GraphQL responses might embed lists; check each element
-                for item in value:
-                    if isinstance(item, dict):
-                        nodes, page_info = DownloadManager._find_pagination_and_data_list(item)
-                        if nodes or page_info.get("hasNextPage", False):
-                            return nodes, page_info
+                children = enumerate(value)
+            else:
+                continue
+            # push in reverse order so that children are visited in their original order
+            stack += [(path + (key,), child) for key, child in reversed(list(children))]
+        return None
+
+    @staticmethod
+    def _find_pagination_and_data_list(response: Dict, query: Optional[str] = None) -> Tuple[List, Dict]:
+        """
+        Find nodes list and page info in a GraphQL response.
+        Every query always has the same response structure, so path to the data
+        is discovered only once per query name and reused for subsequent pages.
+
+        :param response: GraphQL response.
+        :param query: Query name, used for caching data path.
+        :returns: Tuple of (nodes, pageInfo), ([], {'hasNextPage': False}) if not found.
+        """
+        path = DownloadManager._PAGINATION_PATH_CACHE.get(query)
+        if path is not None:
+            try:
+                node = reduce(getitem, path, response)
+                return node["nodes"], node["pageInfo"]
+            except (KeyError, IndexError, TypeError):
+                # structure differs (e.g. missing ref), fall back to traversal
+                pass
 
-        # Fallback: not found
-        return list(), dict(hasNextPage=False)
+        path = DownloadManager._find_pagination_path(response)
+        if path is None:
+            return list(), dict(hasNextPage=False)
+        if query is not None:
+            DownloadManager._PAGINATION_PATH_CACHE[query] = path
+        node = reduce(getitem, path, response)
+        return node["nodes"], node["pageInfo"]
 
     @staticmethod
-    async def _fetch_graphql_paginated(query: str, **kwargs) -> Dict:
-        initial_query_response = await DownloadManager._fetch_graphql_query(
-            query, **kwargs, pagination="first: 100"
+    async def _fetch_graphql_paginated(query: str, **kwargs) -> Tuple[List, bool]:
+        # only pagination changes between pages, so the rest of the query is substituted once
+        document = _COMPILED_QUERIES[query].substitute({**kwargs, "pagination": "$pagination"})
+        initial_query_response = await DownloadManager._post_graphql(
+            query, document.replace("$pagination", "first: 100")
         )
         page_list, page_info = DownloadManager._find_pagination_and_data_list(
-            initial_query_response
+            initial_query_response, query
         )
+        pages = [page_list]
+        complete = not DownloadManager._has_graphql_errors(initial_query_response)
         while page_info["hasNextPage"]:
             pagination = f'first: 100, after: "{page_info["endCursor"]}"'
-            query_response = await DownloadManager._fetch_graphql_query(
-                query, **kwargs, pagination=pagination
+            query_response = await DownloadManager._post_graphql(
+                query, document.replace("$pagination", pagination)
             )
             new_page_list, page_info = DownloadManager._find_pagination_and_data_list(
-                query_response
+                query_response, query
             )
-            page_list += new_page_list
-        return page_list
+            pages.append(new_page_list)
+            complete = complete and not DownloadManager._has_graphql_errors(query_response)
+        return list(chain.from_iterable(pages)), complete
+
+    @staticmethod
+    def _build_batched_document(batch: List[Tuple[int, str]], fields: List[str]) -> str:
+        """
+        Merge several instances of the same query into one GraphQL document.
+
+        :param batch: List of (field index, pagination) pairs to include.
+        :param fields: Aliased top level query fields, with '$pagination' placeholder left.
+        :returns: GraphQL query document.
+        """
+        return "{\n" + "\n".join(fields[index].replace("$pagination", pagination) for index, pagination in batch) + "\n}"
+
+    @staticmethod
+    async def _post_graphql_batch(query: str, batch: List[Tuple[int, str]], fields: List[str]) -> List[Dict]:
+        """
+        Send batched GraphQL document, splitting it in halves if it keeps failing (e.g. because of timeouts).
+        Batches are retried _GRAPHQL_BATCH_RETRIES times before splitting, single queries are retried as usual.
+
+        :param query: Query name, used for logging.
+        :param batch: List of (field index, pagination) pairs to include.
+        :param fields: Aliased top level query fields, with '$pagination' placeholder left.
+        :returns: Parsed GraphQL responses, covering all the fields of the batch.
+        """
+        document = DownloadManager._build_batched_document(batch, fields)
+        if len(batch) == 1:
+            return [await DownloadManager._post_graphql(query, document)]
+        try:
+            return [await DownloadManager._post_graphql(query, document, DownloadManager._GRAPHQL_BATCH_RETRIES)]
+        except Exception as e:
+            DBM.w(f"\tBatched query '{query}' of {len(batch)} fields failed, splitting it: {e}")
+        middle = len(batch) // 2
+        halves = await gather(
+            DownloadManager._post_graphql_batch(query, batch[:middle], fields),
+            DownloadManager._post_graphql_batch(query, batch[middle:], fields),
+        )
+        return list(chain.from_iterable(halves))
+
+    @staticmethod
+    async def _fetch_graphql_batched(query: str, batch_kwargs: List[Dict], arguments: Optional[List[str]] = None) -> List[Tuple[List, bool]]:
+        """
+        Run paginated query with different arguments, merging up to _GRAPHQL_BATCH_SIZE (or _GRAPHQL_BATCH_SIZES) queries into one request.
+        Every request fetches next page for each of the queries that still have one.
+
+        :param query: Query name from GITHUB_API_QUERIES.
+        :param batch_kwargs: Query template arguments list.
+        :param arguments: Additional connection arguments (e.g. 'since: "...", ') for each of the queries, put before pagination.
+        :returns: List of (all nodes, whether response had no errors) pairs for each of the arguments.
+        """
+        arguments = [""] * len(batch_kwargs) if arguments is None else arguments
+        # top level field of every instance gets an alias 'r<index>', so that responses can be told apart;
+        # only pagination changes between requests, so the rest of the queries is substituted once
+        fields = list()
+        for index, kwargs in enumerate(batch_kwargs):
+            body = _COMPILED_QUERIES[query].substitute({**kwargs, "pagination": "$pagination"}).strip()
+            fields.append(f"r{index}: {body[1:-1].strip()}")
+
+        pages = [list() for _ in batch_kwargs]
+        complete = [True for _ in batch_kwargs]
+        paginations = {index: f"{arguments[index]}first: 100" for index in range(len(batch_kwargs))}
+        while len(paginations) > 0:
+            pending = list(paginations.items())
+            size = _GRAPHQL_BATCH_SIZES.get(query, DownloadManager._GRAPHQL_BATCH_SIZE)
+            batches = list()
+            while len(pending) > 0:
+                batches.append(pending[:size])
+                pending = pending[size:]
+            responses = await gather(*[DownloadManager._post_graphql_batch(query, batch, fields) for batch in batches])
+
+            paginations = dict()
+            for response in chain.from_iterable(responses):
+                for alias, sub_response in response["data"].items():
+                    index = int(alias[1:])
+                    complete[index] = complete[index] and not DownloadManager._has_graphql_errors(response, alias)
+                    page_list, page_info = DownloadManager._find_pagination_and_data_list(sub_response, f"{query}_batched")
+                    pages[index].append(page_list)
+                    if page_info["hasNextPage"]:
+                        paginations[index] = f'{arguments[index]}first: 100, after: "{page_info["endCursor"]}"'
+        return [(list(chain.from_iterable(page_lists)), ok) for page_lists, ok in zip(pages, complete)]
+
+    @staticmethod
+    def _read_graphql_disk_cache(query: str, key: Tuple) -> Optional[Dict]:
+        """
+        Load GraphQL query result from persistent cache if the query is listed in _DISK_CACHE_TTL.
+
+        :param query: Query name from GITHUB_API_QUERIES.
+        :param key: Query cache key.
+        :returns: Cache entry with result ('data') and time it was fully fetched ('time'), None if it is missing, corrupted or outdated.
+        """
+        ttl = _DISK_CACHE_TTL.get(query)
+        if ttl is None:
+            return None
+        content = FM.read_cache(f"{query}_{sha256(dumps(key)).hexdigest()}.json")
+        if content is None:
+            return None
+        try:
+            entry = loads(content)
+        except JSONDecodeError:
+            return None
+        if not isinstance(entry, dict) or "data" not in entry or time() - entry.get("time", 0) > ttl:
+            return None
+        DBM.g(f"\tQuery '{query}' loaded from disk cache!")
+        return entry
+
+    @staticmethod
+    def _write_graphql_disk_cache(query: str, key: Tuple, res: Any, fetch_time: Optional[float] = None):
+        """
+        Save GraphQL query result to persistent cache if the query is listed in _DISK_CACHE_TTL.
+
+        :param query: Query name from GITHUB_API_QUERIES.
+        :param key: Query cache key.
+        :param res: Query result.
+        :param fetch_time: Time the result was fully fetched, current time if None.
+        """
+        if query in _DISK_CACHE_TTL:
+            entry = {"time": time() if fetch_time is None else fetch_time, "data": res}
+            FM.write_cache(f"{query}_{sha256(dumps(key)).hexdigest()}.json", dumps(entry))
+
+    @staticmethod
+    async def _fetch_graphql_cached(query: str, key: Tuple, **kwargs) -> Dict:
+        """
+        Run GitHub GraphQL query, using persistent disk cache for queries listed in _DISK_CACHE_TTL.
+
+        :param query: Query name from GITHUB_API_QUERIES.
+        :param key: Query cache key.
+        :param kwargs: Query template arguments.
+        :returns: Query response or list of all nodes for paginated queries.
+        """
+        entry = DownloadManager._read_graphql_disk_cache(query, key)
+        if entry is not None:
+            return entry["data"]
+
+        if "$pagination" in GITHUB_API_QUERIES[query]:
+            res, complete = await DownloadManager._fetch_graphql_paginated(query, **kwargs)
+        else:
+            res = await DownloadManager._fetch_graphql_query(query, **kwargs)
+            complete = not DownloadManager._has_graphql_errors(res)
+
+        # results of responses with errors might be partial, they are only used for current run
+        if complete:
+            DownloadManager._write_graphql_disk_cache(query, key, res)
+        return res
+
+    @staticmethod
+    def _parse_commit_date(node: Dict) -> datetime:
+        """
+        Parse commit date of a commit history node.
+
+        :param node: Commit node.
+        :returns: Timezone aware commit date.
+        """
+        return datetime.fromisoformat(node["committedDate"].replace("Z", "+00:00"))
+
+    @staticmethod
+    def _get_incremental_since(nodes: List[Dict]) -> datetime:
+        """
+        Calculate time commits should be fetched since to update the given ones.
+
+        :param nodes: Cached commits, not empty.
+        :returns: Latest commit date minus _INCREMENTAL_OVERLAP (UTC).
+        """
+        latest = max(DownloadManager._parse_commit_date(node) for node in nodes)
+        return (latest - _INCREMENTAL_OVERLAP).astimezone(timezone.utc).replace(microsecond=0)
+
+    @staticmethod
+    async def _pick_batched_result(batch: Task, position: int, query: str, key: Tuple, entry: Optional[Dict] = None) -> List:
+        """
+        Wait for batched query Task and extract (and save to disk cache) one of its results.
+        If cache entry is provided, the result is an incremental update: it replaces cached nodes
+        from the period it covers (since _get_incremental_since) and is put before the rest of them.
+
+        :param batch: Task running _fetch_graphql_batched.
+        :param position: Position of the result in batch.
+        :param query: Query name from GITHUB_API_QUERIES.
+        :param key: Query cache key.
+        :param entry: Disk cache entry the result updates or None.
+        :returns: List of all nodes for the query.
+        """
+        res, complete = (await batch)[position]
+        if entry is None:
+            # results of responses with errors might be partial, they are only used for current run
+            if complete:
+                DownloadManager._write_graphql_disk_cache(query, key, res)
+            return res
+
+        since = DownloadManager._get_incremental_since(entry["data"])
+        merged = res + [node for node in entry["data"] if DownloadManager._parse_commit_date(node) < since]
+        if complete:
+            DownloadManager._write_graphql_disk_cache(query, key, merged, entry["time"])
+        return merged
+
+    @staticmethod
+    async def _await_graphql_cache(key: Tuple) -> Any:
+        """
+        Get GraphQL query result from cache, awaiting it if the request is still in progress.
+        The resolved result replaces the Task in cache, failed requests are dropped from cache.
+
+        :param key: Query cache key.
+        :returns: Query result.
+        """
+        cached = DownloadManager._REMOTE_RESOURCES_CACHE[key]
+        if not isinstance(cached, Task):
+            return cached
+        try:
+            res = await cached
+        except Exception:
+            # drop failed request from cache, so that it can be retried later
+            if DownloadManager._REMOTE_RESOURCES_CACHE.get(key) is cached:
+                del DownloadManager._REMOTE_RESOURCES_CACHE[key]
+            raise
+        DownloadManager._REMOTE_RESOURCES_CACHE[key] = res
+        return res
 
     @staticmethod
     async def get_remote_graphql(query: str, **kwargs) -> Dict:
-        key = f"{query}_{md5(dumps(kwargs, sort_keys=True).encode('utf-8')).digest()}"
+        """
+        Run GitHub GraphQL query (paginated if needed) and cache the result.
+        The request is stored in the cache as a Task right away,
+        so concurrent calls with the same arguments share a single request.
+
+        :param query: Query name from GITHUB_API_QUERIES.
+        :param kwargs: Query template arguments.
+        :returns: Query response or list of all nodes for paginated queries.
+        """
+        key = (query, tuple(sorted(kwargs.items())))
         if key not in DownloadManager._REMOTE_RESOURCES_CACHE:
-            if "$pagination" in GITHUB_API_QUERIES[query]:
-                res = await DownloadManager._fetch_graphql_paginated(query, **kwargs)
+            request = DownloadManager._fetch_graphql_cached(query, key, **kwargs)
+            DownloadManager._REMOTE_RESOURCES_CACHE[key] = create_task(request)
+        return await DownloadManager._await_graphql_cache(key)
+
+    @staticmethod
+    async def get_remote_graphql_batch(query: str, batch_kwargs: List[Dict]) -> List[List]:
+        """
+        Run paginated GitHub GraphQL query with different arguments and cache the results.
+        Queries that are not cached yet are merged into batched requests using GraphQL aliases.
+        Cached results of _INCREMENTAL_QUERIES are updated with newer nodes only.
+
+        :param query: Paginated query name from GITHUB_API_QUERIES.
+        :param batch_kwargs: Query template arguments list, arguments not used in the template only distinguish cache entries.
+        :returns: List of all nodes for each of the arguments.
+        """
+        keys = [(query, tuple(sorted(kwargs.items()))) for kwargs in batch_kwargs]
+        missing = dict()
+        updated = dict()
+        for key, kwargs in zip(keys, batch_kwargs):
+            if key in DownloadManager._REMOTE_RESOURCES_CACHE or key in missing:
+                continue
+            entry = DownloadManager._read_graphql_disk_cache(query, key)
+            if entry is None:
+                missing[key] = kwargs
+            elif query in _INCREMENTAL_QUERIES:
+                # empty histories have nothing to update, they are simply fetched again
+                missing[key] = kwargs
+                if len(entry["data"]) > 0:
+                    updated[key] = entry
             else:
-                res = await DownloadManager._fetch_graphql_query(query, **kwargs)
-            DownloadManager._REMOTE_RESOURCES_CACHE[key] = res
-        else:
-            res = DownloadManager._REMOTE_RESOURCES_CACHE[key]
-        return res
+                DownloadManager._REMOTE_RESOURCES_CACHE[key] = entry["data"]
+
+        if len(missing) > 0:
+            arguments = list()
+            for key in missing.keys():
+                if key in updated:
+                    since = DownloadManager._get_incremental_since(updated[key]["data"])
+                    arguments.append(f'since: "{since.strftime("%Y-%m-%dT%H:%M:%SZ")}", ')
+                else:
+                    arguments.append("")
+            batch = create_task(DownloadManager._fetch_graphql_batched(query, list(missing.values()), arguments))
+            for position, key in enumerate(missing.keys()):
+                request = DownloadManager._pick_batched_result(batch, position, query, key, updated.get(key))
+                DownloadManager._REMOTE_RESOURCES_CACHE[key] = create_task(request)
+
+        return list(await gather(*[DownloadManager._await_graphql_cache(key) for key in keys]))
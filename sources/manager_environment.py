@@ -1,4 +1,5 @@
 from os import getenv, environ
+from os.path import expanduser, join
 
 
 class EnvironmentManager:
@@ -45,6 +46,7 @@ class EnvironmentManager:
     UPDATED_DATE_FORMAT = getenv("INPUT_UPDATED_DATE_FORMAT", "%d/%m/%Y %H:%M:%S")
     IGNORED_REPOS = getenv("INPUT_IGNORED_REPOS", "").replace(" ", "").split(",")
     SYMBOL_VERSION = int(getenv("INPUT_SYMBOL_VERSION"))
+    CACHE_DIR = getenv("INPUT_CACHE_DIR") or join(expanduser("~"), ".cache", "waka-readme-stats")
 
     DEBUG_LOGGING = getenv("INPUT_DEBUG_LOGGING", "0").lower() in _TRUTHY
     DEBUG_RUN = getenv("DEBUG_RUN", "False").lower() in _TRUTHY
@@ -1,4 +1,6 @@
-from os.path import join, isfile, dirname
+from os import makedirs, remove, replace
+from os.path import basename, join, isfile, dirname
+from tempfile import NamedTemporaryFile
 from pickle import load as load_pickle, dump as dump_pickle
 from json import load as load_json
 from typing import Dict, Optional, Any
@@ -84,3 +86,63 @@ class FileManager:
             else:
                 dump_pickle(content, file)
                 return None
+
+    @staticmethod
+    def has_cache(name: str) -> bool:
+        """
+        Check whether file exists in persistent cache directory (defined with environmental variable).
+
+        :param name: Cache file name.
+        :returns: True if cache file exists, false otherwise.
+        """
+        return isfile(join(EM.CACHE_DIR, name))
+
+    @staticmethod
+    def read_cache(name: str) -> Optional[bytes]:
+        """
+        Read file from persistent cache directory (defined with environmental variable).
+
+        :param name: Cache file name.
+        :returns: Cache file contents or None if it is missing.
+        """
+        name = join(EM.CACHE_DIR, name)
+        if not isfile(name):
+            return None
+        try:
+            with open(name, "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def write_cache(name: str, content: bytes):
+        """
+        Save file to persistent cache directory (defined with environmental variable).
+        The file is written to a temporary file first and then moved in place, so it is never left half-written.
+        Cache is optional, so failures are ignored.
+
+        :param name: Cache file name.
+        :param content: File content (bytes).
+        """
+        file = None
+        try:
+            makedirs(EM.CACHE_DIR, exist_ok=True)
+            with NamedTemporaryFile("wb", dir=EM.CACHE_DIR, prefix=f".{name}.", delete=False) as file:
+                file.write(content)
+            replace(file.name, join(EM.CACHE_DIR, name))
+        except OSError:
+            if file is not None:
+                FileManager.remove_cache(basename(file.name))
+
+    @staticmethod
+    def remove_cache(name: str):
+        """
+        Remove file from persistent cache directory (defined with environmental variable).
+        Cache is optional, so failures (including missing file) are ignored.
+
+        :param name: Cache file name.
+        """
+        try:
+            remove(join(EM.CACHE_DIR, name))
+        except OSError:
+            pass
@@ -1,8 +1,8 @@
-from asyncio import sleep
+from hashlib import sha256
 from json import dumps
 from re import search
 from datetime import datetime
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 from manager_download import DownloadManager as DM
 from manager_environment import EnvironmentManager as EM
@@ -11,6 +11,24 @@ from manager_file import FileManager as FM
 from manager_debug import DebugManager as DBM
 
 
+def get_commit_query() -> str:
+    """
+    Choose the lightest commit history query that provides the data required by enabled sections.
+    Commit additions and deletions are only needed for lines of code stats,
+    commit IDs are only needed for commit day time stats.
+
+    :returns: Commit history query name.
+    """
+    need_stats = EM.SHOW_LINES_OF_CODE or EM.SHOW_LOC_CHART
+    need_ids = EM.SHOW_COMMIT or EM.SHOW_DAYS_OF_WEEK
+    if need_stats and need_ids:
+        return "repo_commit_list"
+    elif need_stats:
+        return "repo_commit_stats"
+    else:
+        return "repo_commit_ids"
+
+
 async def calculate_commit_data(repositories: Dict) -> Tuple[Dict, Dict]:
     """
     Calculate commit data by years.
@@ -30,11 +48,31 @@ async def calculate_commit_data(repositories: Dict) -> Tuple[Dict, Dict]:
 
     yearly_data = dict()
     date_data = dict()
-    for ind, repo in enumerate(repositories):
-        if repo["name"] not in EM.IGNORED_REPOS:
+    repositories = [repo for repo in repositories if repo["name"] not in EM.IGNORED_REPOS]
+    DBM.i(f"\tRetrieving branches of {len(repositories)} repos...")
+    branch_lists = await DM.get_remote_graphql_batch("repo_branch_list", [{"owner": repo["owner"]["login"], "name": repo["name"]} for repo in repositories])
+
+    branches = list()
+    for repo, branch_data in zip(repositories, branch_lists):
+        if len(branch_data) == 0:
             repo_name = "[private]" if repo["isPrivate"] else f"{repo['owner']['login']}/{repo['name']}"
-            DBM.i(f"\t{ind + 1}/{len(repositories)} Retrieving repo: {repo_name}")
-            await update_data_with_commit_stats(repo, yearly_data, date_data)
+            DBM.w(f"\t\tSkipping repo: {repo_name}")
+        # commits merged from another branch can be older than the cached ones, so they are missed by incremental updates;
+        # branch list is part of the cache key, so that histories are fetched in full again once any branch is merged and deleted
+        branch_list = sha256("\n".join(sorted(branch["name"] for branch in branch_data)).encode()).hexdigest()
+        branches += [(repo, branch, branch_list) for branch in branch_data]
+
+    DBM.i(f"\tRetrieving commits of {len(branches)} branches...")
+    commit_query = get_commit_query()
+    commit_lists = await DM.get_remote_graphql_batch(
+        commit_query,
+        [
+            {"owner": repo["owner"]["login"], "name": repo["name"], "branch": branch["name"], "id": GHM.USER.node_id, "branch_list": branch_list}
+            for repo, branch, branch_list in branches
+        ],
+    )
+    for (repo, branch, _), commit_data in zip(branches, commit_lists):
+        update_data_with_commit_stats(repo, branch["name"], commit_data, yearly_data, date_data)
     DBM.g("Commit data calculated!")
 
     if EM.DEBUG_RUN:
@@ -44,43 +82,34 @@ async def calculate_commit_data(repositories: Dict) -> Tuple[Dict, Dict]:
     return yearly_data, date_data
 
 
-async def update_data_with_commit_stats(repo_details: Dict, yearly_data: Dict, date_data: Dict):
+def update_data_with_commit_stats(repo_details: Dict, branch_name: str, commit_data: List[Dict], yearly_data: Dict, date_data: Dict):
     """
-    Updates yearly commit data with commits from given repository.
-    Skips update if the commit isn't related to any repository.
+    Updates yearly commit data with commits from given repository branch.
 
     :param repo_details: Dictionary with information about the given repository.
+    :param branch_name: Name of the branch commits belong to.
+    :param commit_data: List of the branch commits.
     :param yearly_data: Yearly data dictionary to update.
     :param date_data: Commit date dictionary to update.
     """
-    owner = repo_details["owner"]["login"]
-    branch_data = await DM.get_remote_graphql("repo_branch_list", owner=owner, name=repo_details["name"])
-    if len(branch_data) == 0:
-        DBM.w("\t\tSkipping repo.")
-        return
-
-    for branch in branch_data:
-        commit_data = await DM.get_remote_graphql("repo_commit_list", owner=owner, name=repo_details["name"], branch=branch["name"], id=GHM.USER.node_id)
-        for commit in commit_data:
-            date = search(r"\d+-\d+-\d+", commit["committedDate"]).group()
-            curr_year = datetime.fromisoformat(date).year
-            quarter = (datetime.fromisoformat(date).month - 1) // 3 + 1
+    for commit in commit_data:
+        date = search(r"\d+-\d+-\d+", commit["committedDate"]).group()
+        curr_year = datetime.fromisoformat(date).year
+        quarter = (datetime.fromisoformat(date).month - 1) // 3 + 1
 
+        if "oid" in commit:
             if repo_details["name"] not in date_data:
                 date_data[repo_details["name"]] = dict()
-            if branch["name"] not in date_data[repo_details["name"]]:
-                date_data[repo_details["name"]][branch["name"]] = dict()
-            date_data[repo_details["name"]][branch["name"]][commit["oid"]] = commit["committedDate"]
-
-            if repo_details["primaryLanguage"] is not None:
-                if curr_year not in yearly_data:
-                    yearly_data[curr_year] = dict()
-                if quarter not in yearly_data[curr_year]:
-                    yearly_data[curr_year][quarter] = dict()
-                if repo_details["primaryLanguage"]["name"] not in yearly_data[curr_year][quarter]:
-                    yearly_data[curr_year][quarter][repo_details["primaryLanguage"]["name"]] = {"add": 0, "del": 0}
-                yearly_data[curr_year][quarter][repo_details["primaryLanguage"]["name"]]["add"] += commit["additions"]
-                yearly_data[curr_year][quarter][repo_details["primaryLanguage"]["name"]]["del"] += commit["deletions"]
-
-        if not EM.DEBUG_RUN:
-            await sleep(0.4)
+            if branch_name not in date_data[repo_details["name"]]:
+                date_data[repo_details["name"]][branch_name] = dict()
+            date_data[repo_details["name"]][branch_name][commit["oid"]] = commit["committedDate"]
+
+        if "additions" in commit and repo_details["primaryLanguage"] is not None:
+            if curr_year not in yearly_data:
+                yearly_data[curr_year] = dict()
+            if quarter not in yearly_data[curr_year]:
+                yearly_data[curr_year][quarter] = dict()
+            if repo_details["primaryLanguage"]["name"] not in yearly_data[curr_year][quarter]:
+                yearly_data[curr_year][quarter][repo_details["primaryLanguage"]["name"]] = {"add": 0, "del": 0}
+            yearly_data[curr_year][quarter][repo_details["primaryLanguage"]["name"]]["add"] += commit["additions"]
+            yearly_data[curr_year][quarter][repo_details["primaryLanguage"]["name"]]["del"] += commit["deletions"]